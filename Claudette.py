@@ -42,11 +42,13 @@ def plugin_loaded():
 
 
 def plugin_unloaded():
+    from .api import connection
     from .chat.chat_view import ClaudetteChatView
     from .utils import claudette_clear_copy_path_phantom_registry
 
     ClaudetteChatView._instances.clear()
     claudette_clear_copy_path_phantom_registry()
+    connection.close_all()
 
 
 class ClaudetteFocusListener(sublime_plugin.EventListener):
@@ -1,11 +1,14 @@
 import json
 import os
+import re
 import select
 import socket
 import ssl
+import time
 import urllib.error
 import urllib.parse
-import urllib.request
+from functools import lru_cache, partial
+from operator import itemgetter
 
 import sublime
 
@@ -15,7 +18,9 @@ from ..constants import (
     DEFAULT_MODEL,
     DEFAULT_VERIFY_SSL,
     MAX_TOKENS,
+    MODELS_CACHE_TTL_SECONDS,
     SETTINGS_FILE,
+    STREAM_READ_SIZE,
 )
 from ..statusbar.spinner import ClaudetteSpinner
 from ..tools.text_editor import (
@@ -24,8 +29,9 @@ from ..tools.text_editor import (
     run_text_editor_tool,
 )
 from ..utils import claudette_chat_status_message, claudette_get_api_key_value
-from . import session_stats
+from . import connection, session_stats
 from .cancellation import CancellationToken
+from .dispatcher import MainThreadDispatcher
 from .errors import (
     handle_model_not_found,
     is_model_not_found_error,
@@ -39,6 +45,162 @@ from .tools import (
     parse_web_search_items,
 )
 
+# Fixed formatting instructions sent as the first system message. Shared by
+# every request; never mutated.
+_FORMAT_SYSTEM_MESSAGE = {
+    "type": "text",
+    "text": (
+        "Format responses in markdown. Do not add a summary "
+        "before your answer. Wrap code in fenced code blocks.\n\n"
+        "If the reponse warrants being structured in sections, "
+        "use this heading structure (h1 is reserved for the chat "
+        "interface):\n\n"
+        "Content here.\n\n"
+        "## Subtopic\n\n"
+        "More content.\n\n"
+        "```python\n"
+        "# code example\n"
+        "```"
+    ),
+}
+
+
+# Text editor tool command -> verb shown in the status while it runs
+_TOOL_CMD_LABELS = {
+    "view": "Reading",
+    "str_replace": "Editing",
+    "create": "Creating",
+    "insert": "Editing",
+}
+
+
+# json.dumps() builds a new JSONEncoder whenever non-default options are
+# passed, so keep one configured encoder around instead.
+_encode_json = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":")
+).encode
+
+
+def _encode_request_body(data):
+    """Serialize a request payload to compact UTF-8 JSON bytes.
+
+    Non-ASCII text is written as-is rather than as \\uXXXX escapes, which
+    keeps large chat histories and context files smaller on the wire and
+    cheaper to encode.
+    """
+    return _encode_json(data).encode("utf-8")
+
+
+def _encode_messages_body(messages, encoded_fields):
+    """Splice messages into a body whose other fields are pre-encoded.
+
+    encoded_fields is the output of _encode_request_body() for a non-empty
+    dict, minus its opening brace.
+    """
+    messages_json = _encode_request_body(messages)
+    return b"".join((b'{"messages":', messages_json, b",", encoded_fields))
+
+
+@lru_cache(maxsize=2)
+def _build_ssl_context(verify):
+    """Return the shared SSL context for a verify_ssl value.
+
+    An API instance is created per request, so the context is cached here
+    rather than on the instance; loading the system CA store is expensive.
+    """
+    # Use default SSL context with verification enabled
+    ssl_context = ssl.create_default_context()
+    if not verify:
+        # Unverified SSL context for self-signed certificates
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+# Exact wire shape of a plain text delta, the bulk of every stream
+_TEXT_DELTA_RE = re.compile(
+    rb'\{"type":"content_block_delta","index":\d+,'
+    rb'"delta":\{"type":"text_delta","text":"((?:[^"\\]|\\.)*)"\}\}'
+)
+
+
+def _parse_text_delta(payload):
+    """Return the text of a plain text_delta event payload, or None.
+
+    Lets the stream loop skip building the event dicts for the most common
+    event. Anything else (citations, other deltas, unexpected key order)
+    returns None and is parsed with json.loads as usual.
+    """
+    match = _TEXT_DELTA_RE.fullmatch(payload)
+    if match is None:
+        return None
+    raw = match.group(1)
+    try:
+        if b"\\" not in raw:
+            return raw.decode("utf-8")
+        # Escapes present: let json resolve them
+        return json.loads(b'"' + raw + b'"')
+    except ValueError:
+        return None
+
+
+def _peek_buffered(fp, sock):
+    """Return bytes fp can hand out without waiting on the network.
+
+    select() only sees the socket, not bytes already pulled into the
+    response's read buffer or decrypted by TLS. Peeks with a non-blocking
+    socket and restores the previous timeout afterwards.
+    """
+    timeout = sock.gettimeout()
+    try:
+        sock.settimeout(0.0)
+        return fp.peek(1) or b""
+    except OSError:
+        return b""
+    finally:
+        sock.settimeout(timeout)
+
+
+def _has_buffered_data(response, sock):
+    """Return True if response.read1() can return without touching sock.
+
+    For a chunked body, buffered bytes are not enough: at the end of a
+    chunk read1() first consumes the chunk's CRLF and the next size line
+    (and, for the last chunk, the trailer) and would block on the socket
+    if those have not fully arrived, so they must all be in the buffer.
+    """
+    if not response.chunked and (
+        response.length == 0 or response.isclosed()
+    ):
+        # Body used up: read1() returns b"" at once. The socket stays
+        # idle on a kept-alive connection, so select() would never wake.
+        return True
+    buffered = _peek_buffered(response.fp, sock)
+    if not buffered:
+        return False
+    if not response.chunked or response.chunk_left:
+        return True
+
+    # chunk_left is 0 after a chunk (its CRLF is still unread) or None
+    # before the first one
+    start = 2 if response.chunk_left == 0 else 0
+    size_end = buffered.find(b"\n", start)
+    if size_end == -1:
+        return False
+    try:
+        size = int(buffered[start:size_end].split(b";", 1)[0], 16)
+    except ValueError:
+        # Let read1() raise for the malformed chunk
+        return True
+    if size:
+        return len(buffered) > size_end + 1
+    return buffered.find(b"\n", size_end + 1) != -1
+
+
+# (models_url, api_key) -> (monotonic fetch time, model ids). The model
+# list rarely changes, so the select model panel reuses it for a while.
+_models_cache = {}
+
 
 class CancelledException(Exception):
     """Raised when a request is cancelled."""
@@ -50,38 +212,79 @@ class ClaudetteClaudeAPI:
     def __init__(self):
         self.settings = sublime.load_settings(SETTINGS_FILE)
         self.api_key = claudette_get_api_key_value()
+        self.session_cost = 0.0
+        self.session_input_tokens = 0
+        self.session_output_tokens = 0
+        self.spinner = ClaudetteSpinner()
+        self._refresh_settings()
+
+    def _refresh_settings(self):
+        """Read the settings used on the request path into attributes.
+
+        Requests then use plain attribute access instead of going through
+        settings.get() each turn and each text editor tool round.
+        """
         self.base_url = self.settings.get("base_url", DEFAULT_BASE_URL)
+        self.messages_url = urllib.parse.urljoin(self.base_url, "messages")
+        self.models_url = urllib.parse.urljoin(self.base_url, "models")
+        self._uses_tls = (
+            urllib.parse.urlsplit(self.base_url).scheme.lower() == "https"
+        )
         try:
             self.max_tokens = int(self.settings.get("max_tokens", MAX_TOKENS))
         except (TypeError, ValueError):
             self.max_tokens = MAX_TOKENS
         self.model = self.settings.get("model", DEFAULT_MODEL)
-        self.temperature = self.settings.get("temperature", "1.0")
-        self.session_cost = 0.0
-        self.session_input_tokens = 0
-        self.session_output_tokens = 0
-        self.spinner = ClaudetteSpinner()
+        self.temperature = self.get_valid_temperature(
+            self.settings.get("temperature", "1.0")
+        )
+        # Request fields shared by every payload built from these settings
+        self._base_payload = {
+            "max_tokens": self.max_tokens,
+            "model": self.model,
+            "temperature": self.temperature,
+        }
         self.pricing = self.settings.get("pricing")
         self.verify_ssl = self.settings.get("verify_ssl", DEFAULT_VERIFY_SSL)
+        # Cost is only ever computed for the configured model
+        self._price_tier = (
+            session_stats.find_price_tier(self.pricing, self.model) or {}
+        )
+        # Format prompt and selected system message only depend on settings
+        self._base_system_messages = self._build_base_system_messages()
+        # Tool config only changes with settings, so resolve it once
+        # instead of on every tool loop request.
+        self.text_editor_tool = build_text_editor_tool_def(
+            self.settings, self.model
+        )
+        self.web_search_tool = build_web_search_tool_def(self.settings)
+        try:
+            self.text_editor_max_characters = int(
+                self.settings.get("text_editor_tool_max_characters", 0)
+            )
+        except (TypeError, ValueError):
+            self.text_editor_max_characters = None
+        custom = self.settings.get("custom_headers", {})
+        if isinstance(custom, dict):
+            self.custom_headers = {
+                str(k): str(v) for k, v in custom.items() if k
+            }
+        else:
+            self.custom_headers = {}
 
     def _get_ssl_context(self):
-        """Create and return an SSL context based on verify_ssl setting."""
-        if self.verify_ssl:
-            # Use default SSL context with verification enabled
-            return ssl.create_default_context()
-        else:
-            # Create unverified SSL context for self-signed certificates
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            return ssl_context
+        """Return an SSL context based on verify_ssl setting.
+
+        Returns None for a plain http:// base_url (e.g. a local gateway),
+        which needs no TLS.
+        """
+        if not self._uses_tls:
+            return None
+        return _build_ssl_context(bool(self.verify_ssl))
 
     def _get_custom_headers(self):
         """Return custom headers from settings, if any."""
-        custom = self.settings.get("custom_headers", {})
-        if isinstance(custom, dict):
-            return {str(k): str(v) for k, v in custom.items() if k}
-        return {}
+        return self.custom_headers
 
     @staticmethod
     def get_valid_temperature(temp):
@@ -98,35 +301,97 @@ class ClaudetteClaudeAPI:
         """Return True if message has content (str or list for tool turns)."""
         content = msg.get("content")
         if isinstance(content, str):
-            return bool(content.strip())
-        if isinstance(content, list):
-            return len(content) > 0
-        return False
+            # isspace() answers this without copying the string like strip()
+            return bool(content) and not content.isspace()
+        return isinstance(content, list) and len(content) > 0
+
+    @staticmethod
+    def _iter_response_lines(response, is_cancelled):
+        """
+        Yield raw lines (without the trailing newline) from a streaming
+        response.
+
+        Reads up to STREAM_READ_SIZE bytes per call into a bytearray and
+        splits it on newlines, instead of letting readline() pull the body
+        through in small increments. Lines are yielded as bytearrays.
+        Raises CancelledException when is_cancelled()
+        returns True between reads.
+        """
+        # Get socket for select-based polling with timeout
+        # This allows us to periodically check for cancellation
+        sock = None
+        try:
+            # Try to get the underlying socket
+            if hasattr(response.fp, "raw"):
+                raw = response.fp.raw
+                if hasattr(raw, "_sock"):
+                    sock = raw._sock
+        except Exception:
+            pass
+
+        # When we cannot extract the raw socket for select(),
+        # set a short read timeout so reads don't block
+        # indefinitely — this lets us check cancellation often.
+        if sock is None:
+            try:
+                response.fp._sock.settimeout(0.5)
+            except Exception:
+                pass
+
+        # Bytes after the last newline, i.e. the start of the next line
+        pending = bytearray()
+        while True:
+            # Check for cancellation before reading
+            if is_cancelled():
+                raise CancelledException()
+
+            # Use select to wait for data with timeout, unless data is
+            # already buffered (select would not report it).
+            if sock is not None and not _has_buffered_data(response, sock):
+                try:
+                    ready, _, _ = select.select([sock], [], [], 0.3)
+                    if not ready:
+                        # Timeout, check cancellation and retry
+                        continue
+                except (ValueError, OSError, TypeError):
+                    # Socket issue, fall through to blocking read
+                    sock = None
+                    try:
+                        response.fp._sock.settimeout(0.5)
+                    except Exception:
+                        pass
+
+            try:
+                data = response.read1(STREAM_READ_SIZE)
+            except socket.timeout:
+                # Read timed out — loop back to check cancellation
+                continue
+            if not data:
+                # End of stream
+                break
+
+            pending += data
+            if b"\n" not in data:
+                # Partial line (e.g. a large event spanning several reads);
+                # keep growing the buffer in place instead of re-joining.
+                continue
+            lines = pending.split(b"\n")
+            pending = lines.pop()
+            yield from lines
+
+        if pending:
+            yield pending
 
     def _get_text_editor_tool_def(self):
         """Return text editor tool definition, or None if disabled."""
-        return build_text_editor_tool_def(self.settings, self.model)
+        return self.text_editor_tool
 
-    def _build_system_messages(self, chat_view=None):
-        """Build system messages list (with optional context files)."""
-        system_messages = [
-            {
-                "type": "text",
-                "text": (
-                    "Format responses in markdown. Do not add a summary "
-                    "before your answer. Wrap code in fenced code blocks.\n\n"
-                    "If the reponse warrants being structured in sections, "
-                    "use this heading structure (h1 is reserved for the chat "
-                    "interface):\n\n"
-                    "Content here.\n\n"
-                    "## Subtopic\n\n"
-                    "More content.\n\n"
-                    "```python\n"
-                    "# code example\n"
-                    "```"
-                ),
-            }
-        ]
+    def _build_base_system_messages(self):
+        """Build the settings-driven system messages shared by requests.
+
+        Returned as a tuple so callers copy it before appending.
+        """
+        system_messages = [_FORMAT_SYSTEM_MESSAGE]
 
         settings_system_messages = self.settings.get("system_messages", [])
         default_index = self.settings.get("default_system_message_index", 0)
@@ -138,12 +403,20 @@ class ClaudetteClaudeAPI:
             and 0 <= default_index < len(settings_system_messages)
         ):
             selected_message = settings_system_messages[default_index]
-            if selected_message and selected_message.strip():
+            if selected_message:
+                selected_message = selected_message.strip()
+            if selected_message:
                 system_messages.append(
-                    {"type": "text", "text": selected_message.strip()}
+                    {"type": "text", "text": selected_message}
                 )
 
-        if self.settings.get("text_editor_tool", False) and chat_view:
+        return tuple(system_messages)
+
+    def _build_system_messages(self, chat_view=None):
+        """Build system messages list (with optional context files)."""
+        system_messages = list(self._base_system_messages)
+
+        if self.text_editor_tool and chat_view:
             view = getattr(chat_view, "view", chat_view)
             window = view.window() if view else None
             if window:
@@ -179,32 +452,59 @@ class ClaudetteClaudeAPI:
             context_files = chat_view.settings().get(
                 "claudette_context_files", {}
             )
-            if context_files:
-                combined_content = "<reference_files>\n"
-                for file_path, file_info in context_files.items():
-                    if file_info.get("content"):
-                        combined_content += "<file>\n"
-                        combined_content += f"<path>{file_path}</path>\n"
-                        combined_content += (
-                            f"<content>\n{file_info['content']}\n</content>\n"
+            # Collect the pieces and join once; repeated += on the
+            # accumulated string copies every file again, and formatting
+            # each file into its own string would copy it once more.
+            parts = ["<reference_files>\n"]
+            for file_path, file_info in context_files.items():
+                content = file_info.get("content")
+                if content:
+                    parts.extend(
+                        (
+                            "<file>\n<path>",
+                            file_path,
+                            "</path>\n<content>\n",
+                            content,
+                            "\n</content>\n</file>\n",
                         )
-                        combined_content += "</file>\n"
-                combined_content += "</reference_files>"
-
-                if combined_content != "<reference_files>\n</reference_files>":
-                    system_message = {"type": "text", "text": combined_content}
-                    system_message["cache_control"] = {"type": "ephemeral"}
-                    system_messages.append(system_message)
+                    )
+            if len(parts) > 1:
+                parts.append("</reference_files>")
+                system_messages.append(
+                    {"type": "text", "text": "".join(parts)}
+                )
 
+        # One prompt cache breakpoint on the last block caches the whole
+        # system prefix. Copy it: base messages are shared across requests.
+        system_messages[-1] = dict(
+            system_messages[-1], cache_control={"type": "ephemeral"}
+        )
         return system_messages
 
+    def _encode_non_streaming_fields(self, system_messages, tools_list=None):
+        """Encode everything but the messages of a non-streaming request.
+
+        The system prompt (which may include every context file) and the
+        tools stay the same for each round of the text editor tool loop, so
+        they are serialized once and spliced into each request body.
+        """
+        data = {
+            **self._base_payload,
+            "stream": False,
+            "system": system_messages,
+        }
+        if tools_list:
+            data["tools"] = tools_list
+        return _encode_request_body(data)[1:]
+
     def _request_non_streaming(
-        self, messages, system_messages, tools_list=None,
-        cancellation_token=None,
+        self, messages, encoded_fields, cancellation_token=None
     ):
         """
         Send a single non-streaming request.
 
+        encoded_fields comes from _encode_non_streaming_fields().
+
         Returns (response_message_dict, usage_dict).
         response_message_dict has 'content' (list of blocks) and
         'stop_reason'.
@@ -220,27 +520,14 @@ class ClaudetteClaudeAPI:
         }
         headers.update(self._get_custom_headers())
 
-        data = {
-            "messages": messages,
-            "max_tokens": self.max_tokens,
-            "model": self.model,
-            "stream": False,
-            "system": system_messages,
-            "temperature": self.get_valid_temperature(self.temperature),
-        }
-        if tools_list:
-            data["tools"] = tools_list
-
-        req = urllib.request.Request(
-            urllib.parse.urljoin(self.base_url, "messages"),
-            data=json.dumps(data).encode("utf-8"),
+        # Pooled keep-alive connection: tool loop rounds after the first
+        # skip the TCP and TLS handshake.
+        with connection.open_request(
+            self.messages_url,
+            data=_encode_messages_body(messages, encoded_fields),
             headers=headers,
-            method="POST",
-        )
-
-        ssl_context = self._get_ssl_context()
-        with urllib.request.urlopen(
-            req, context=ssl_context, timeout=30
+            context=self._get_ssl_context(),
+            timeout=30,
         ) as response:
             # Read in chunks so we can check for cancellation mid-flight
             # instead of blocking for up to 30 seconds.
@@ -249,7 +536,9 @@ class ClaudetteClaudeAPI:
                     response.fp._sock.settimeout(0.5)
                 except Exception:
                     pass
-                chunks = []
+                # Grow one buffer in place rather than joining a list of
+                # chunks, which would hold the body twice at the end.
+                raw = bytearray()
                 while True:
                     if cancellation_token.is_cancelled():
                         response.close()
@@ -260,11 +549,10 @@ class ClaudetteClaudeAPI:
                         continue
                     if not chunk:
                         break
-                    chunks.append(chunk)
-                raw = b"".join(chunks)
+                    raw += chunk
             else:
                 raw = response.read()
-            body = json.loads(raw.decode("utf-8"))
+            body = json.loads(raw)
 
         # Response may have message nested under 'message' or be the
         # message at top level.
@@ -293,7 +581,7 @@ class ClaudetteClaudeAPI:
 
         def handle_error(error_msg):
             sublime.set_timeout(
-                lambda: chunk_callback(error_msg, is_done=True), 0
+                partial(chunk_callback, error_msg, is_done=True), 0
             )
 
         def check_cancelled():
@@ -317,9 +605,8 @@ class ClaudetteClaudeAPI:
             return
 
         tools_list = [text_editor_tool]
-        web_search_tool = build_web_search_tool_def(self.settings)
-        if web_search_tool:
-            tools_list.append(web_search_tool)
+        if self.web_search_tool:
+            tools_list.append(self.web_search_tool)
 
         # chat_view may be sublime View or ClaudetteChatView (.view,
         # .set_tool_status, .clear_tool_status).
@@ -329,31 +616,37 @@ class ClaudetteClaudeAPI:
         )
 
         system_messages = self._build_system_messages(view_for_api)
+        encoded_fields = self._encode_non_streaming_fields(
+            system_messages, tools_list
+        )
         window = view_for_api.window() if view_for_api else None
         settings = self.settings
-        try:
-            max_chars = int(
-                self.settings.get("text_editor_tool_max_characters", 0)
+        max_chars = self.text_editor_max_characters
+        # Only used to resolve tool paths. Read it once: every settings get
+        # converts the stored dict, file contents included, to new objects.
+        context_files = None
+        if view_for_api and hasattr(view_for_api, "settings"):
+            context_files = view_for_api.settings().get(
+                "claudette_context_files"
             )
-        except (TypeError, ValueError):
-            max_chars = None
 
         try:
             self.spinner.start("Fetching response")
-            current_messages = list(filtered)
+            # filtered is already a fresh list, safe to extend in place
+            current_messages = filtered
 
             while True:
                 check_cancelled()
                 try:
                     msg, usage = self._request_non_streaming(
-                        current_messages, system_messages, tools_list,
+                        current_messages, encoded_fields,
                         cancellation_token=cancellation_token,
                     )
                 except urllib.error.HTTPError as e:
                     self.spinner.stop()
                     if chat_view_for_status:
                         sublime.set_timeout(
-                            lambda: chat_view_for_status.clear_tool_status(), 0
+                            chat_view_for_status.clear_tool_status, 0
                         )
                     error_type, error_message = parse_api_error(e)
                     if is_model_not_found_error(
@@ -369,7 +662,7 @@ class ClaudetteClaudeAPI:
                     self.spinner.stop()
                     if chat_view_for_status:
                         sublime.set_timeout(
-                            lambda: chat_view_for_status.clear_tool_status(), 0
+                            chat_view_for_status.clear_tool_status, 0
                         )
                     handle_error("[Error] {0}".format(str(e)))
                     return
@@ -395,33 +688,22 @@ class ClaudetteClaudeAPI:
                             chat_view_for_status.set_tool_status(label)
 
                     sublime.set_timeout(
-                        lambda: update_status("Reading/editing files…"), 0
+                        partial(update_status, "Reading/editing files…"), 0
                     )
                     tool_results = []
                     assistant_content = []
                     for block in content:
                         if not isinstance(block, dict):
                             continue
-                        if block.get("type") == "text" and block.get("text"):
+                        btype = block.get("type")
+                        if btype == "text" and block.get("text"):
                             assistant_content.append(block)
-                        elif block.get("type") == "tool_use":
+                        elif btype == "tool_use":
                             assistant_content.append(block)
                             inp = block.get("input", {})
                             raw_path = inp.get("path", "") or "file"
                             cmd = inp.get("command", "view")
-                            action = {
-                                "view": "Reading",
-                                "str_replace": "Editing",
-                                "create": "Creating",
-                                "insert": "Editing",
-                            }.get(cmd, "Processing")
-                            context_files = None
-                            if view_for_api and hasattr(
-                                view_for_api, "settings"
-                            ):
-                                context_files = view_for_api.settings().get(
-                                    "claudette_context_files"
-                                )
+                            action = _TOOL_CMD_LABELS.get(cmd, "Processing")
                             allowed_roots = get_allowed_roots(window, settings)
                             resolved, _ = resolve_path(
                                 raw_path,
@@ -456,7 +738,7 @@ class ClaudetteClaudeAPI:
                                 action, display_path
                             )
                             sublime.set_timeout(
-                                lambda s=status_label: update_status(s), 0
+                                partial(update_status, status_label), 0
                             )
                             result = run_text_editor_tool(
                                 block.get("id", ""),
@@ -484,7 +766,7 @@ class ClaudetteClaudeAPI:
                     self.spinner.stop()
                     if chat_view_for_status:
                         sublime.set_timeout(
-                            lambda: chat_view_for_status.clear_tool_status(), 0
+                            chat_view_for_status.clear_tool_status, 0
                         )
                     text_parts = []
                     sources_lines = []
@@ -493,9 +775,10 @@ class ClaudetteClaudeAPI:
                     for block in content:
                         if not isinstance(block, dict):
                             continue
-                        if block.get("type") == "text" and block.get("text"):
+                        btype = block.get("type")
+                        if btype == "text" and block.get("text"):
                             text_parts.append(block["text"])
-                        elif block.get("type") == "web_search_tool_result":
+                        elif btype == "web_search_tool_result":
                             items_lines, _ = parse_web_search_items(
                                 block.get("content", [])
                             )
@@ -507,23 +790,21 @@ class ClaudetteClaudeAPI:
                     sources_text = format_search_results(sources_lines)
                     if sources_text:
                         sublime.set_timeout(
-                            lambda t=sources_text: chunk_callback(
-                                t, is_done=False
+                            partial(
+                                chunk_callback, sources_text, is_done=False
                             ),
                             0,
                         )
                     if final_text:
                         sublime.set_timeout(
-                            lambda t=final_text: chunk_callback(
-                                t, is_done=False
-                            ),
+                            partial(chunk_callback, final_text, is_done=False),
                             0,
                         )
                     input_tokens = usage.get("input_tokens", 0)
                     output_tokens = usage.get("output_tokens", 0)
                     cache_read_tokens = usage.get("cache_read_input_tokens", 0)
                     cache_write_tokens = usage.get(
-                        "cache_write_input_tokens", 0
+                        "cache_creation_input_tokens", 0
                     )
                     server_tool_use = usage.get("server_tool_use", {})
                     web_search_requests = server_tool_use.get(
@@ -537,6 +818,7 @@ class ClaudetteClaudeAPI:
                         output_tokens,
                         cache_read_tokens=cache_read_tokens,
                         cache_write_tokens=cache_write_tokens,
+                        price_tier=self._price_tier,
                     )
                     web_search_cost = web_search_requests * (10.0 / 1000)
                     current_cost += web_search_cost
@@ -549,13 +831,13 @@ class ClaudetteClaudeAPI:
                     )
                     if sess:
                         cache_info = ""
-                        if usage.get("cache_read_input_tokens"):
+                        if cache_read_tokens:
                             cache_info = " (cache read: {0:,})".format(
-                                usage.get("cache_read_input_tokens", 0)
+                                cache_read_tokens
                             )
-                        elif usage.get("cache_write_input_tokens"):
+                        elif cache_write_tokens:
                             cache_info = " (cache write: {0:,})".format(
-                                usage.get("cache_write_input_tokens", 0)
+                                cache_write_tokens
                             )
                         status_msg = format_status_message(
                             input_tokens,
@@ -565,7 +847,7 @@ class ClaudetteClaudeAPI:
                             sess["cost"],
                         )
                         sublime.set_timeout(
-                            lambda s=status_msg: sublime.status_message(s), 100
+                            partial(sublime.status_message, status_msg), 100
                         )
                     usage_info = {
                         "input_tokens": input_tokens,
@@ -574,8 +856,9 @@ class ClaudetteClaudeAPI:
                         "session_cost": sess["cost"] if sess else current_cost,
                     }
                     sublime.set_timeout(
-                        lambda u=usage_info: chunk_callback(
-                            "", is_done=True, usage_info=u
+                        partial(
+                            chunk_callback, "", is_done=True,
+                            usage_info=usage_info,
                         ),
                         0,
                     )
@@ -584,7 +867,7 @@ class ClaudetteClaudeAPI:
                 self.spinner.stop()
                 if chat_view_for_status:
                     sublime.set_timeout(
-                        lambda: chat_view_for_status.clear_tool_status(), 0
+                        chat_view_for_status.clear_tool_status, 0
                     )
                 handle_error(
                     "[Error] Unexpected stop_reason: {0}. "
@@ -598,44 +881,64 @@ class ClaudetteClaudeAPI:
             self.spinner.stop()
             if chat_view_for_status:
                 sublime.set_timeout(
-                    lambda: chat_view_for_status.clear_tool_status(), 0
+                    chat_view_for_status.clear_tool_status, 0
                 )
             sublime.set_timeout(
-                lambda: chunk_callback("", is_done=True, was_cancelled=True), 0
+                partial(chunk_callback, "", is_done=True, was_cancelled=True),
+                0,
             )
         except Exception as e:
             self.spinner.stop()
             if chat_view_for_status:
                 sublime.set_timeout(
-                    lambda: chat_view_for_status.clear_tool_status(), 0
+                    chat_view_for_status.clear_tool_status, 0
                 )
             handle_error("[Error] {0}".format(str(e)))
 
     def stream_response(
-        self, chunk_callback, messages, chat_view=None, cancellation_token=None
+        self,
+        chunk_callback,
+        messages,
+        chat_view=None,
+        cancellation_token=None,
+        text_callback=None,
     ):
         """
         Stream a response from the API.
 
         If cancellation_token is provided, checks for cancellation during
-        streaming and exits early if cancelled.
+        streaming and exits early if cancelled. Streamed text goes to
+        text_callback(parts) in batches of deltas when given, else to
+        chunk_callback one delta at a time.
         """
+        if text_callback is None:
+
+            def text_callback(parts):
+                for text in parts:
+                    chunk_callback(text, is_done=False)
+
         input_tokens = 0
         output_tokens = 0
+        cache_read_tokens = 0
+        cache_write_tokens = 0
         web_search_requests = 0
         cache_info = ""
 
+        # Main-thread callbacks go through one batched pump
+        dispatcher = MainThreadDispatcher()
+        post = dispatcher.post
+        post_text = dispatcher.post_text
+
         def handle_error(error_msg):
-            sublime.set_timeout(
-                lambda: chunk_callback(error_msg, is_done=True), 0
-            )
+            post(chunk_callback, error_msg, is_done=True)
 
         def is_cancelled():
             return cancellation_token and cancellation_token.is_cancelled()
 
-        if not messages or not any(
-            self._message_has_content(msg) for msg in messages
-        ):
+        filtered_messages = [
+            msg for msg in messages or () if self._message_has_content(msg)
+        ]
+        if not filtered_messages:
             return
 
         if not self.api_key:
@@ -645,6 +948,212 @@ class ClaudetteClaudeAPI:
             )
             return
 
+        stream_web_search_sources = []
+        stream_current_block_type = None
+        stream_current_block_index = None
+        message_stopped = False
+        # Last citation link written with no text after it yet
+        last_citation_link = None
+
+        def on_message_start(data):
+            # Get initial input tokens from message_start
+            nonlocal input_tokens, cache_info
+            nonlocal cache_read_tokens, cache_write_tokens
+            usage = (data.get("message") or {}).get("usage") or {}
+            input_tokens = usage.get("input_tokens", 0)
+            cache_read_tokens = usage.get("cache_read_input_tokens", 0)
+            cache_write_tokens = usage.get("cache_creation_input_tokens", 0)
+            if cache_read_tokens > 0:
+                cache_info = f" (cache read: {cache_read_tokens:,})"
+            elif cache_write_tokens > 0:
+                cache_info = f" (cache write: {cache_write_tokens:,})"
+
+        def on_content_block_start(data):
+            # Web search: track block and accumulate sources
+            # from start/delta/stop
+            nonlocal stream_web_search_sources
+            nonlocal stream_current_block_type, stream_current_block_index
+            content_block = data.get("content_block", {})
+            block_type = content_block.get("type")
+            stream_current_block_index = data.get("index")
+            stream_current_block_type = block_type
+
+            if (
+                block_type == "server_tool_use"
+                and content_block.get("name") == "web_search"
+            ):
+                post(sublime.status_message, "Searching the web...")
+            elif block_type == "web_search_tool_result":
+                stream_web_search_sources = []
+                sources_lines, has_error = parse_web_search_items(
+                    content_block.get("content", [])
+                )
+                if has_error:
+                    err_item = next(
+                        (
+                            it
+                            for it in (content_block.get("content") or [])
+                            if isinstance(it, dict)
+                            and it.get("type")
+                            == "web_search_tool_result_error"
+                        ),
+                        None,
+                    )
+                    error_code = (
+                        err_item.get("error_code", "unavailable")
+                        if err_item
+                        else "unavailable"
+                    )
+                    err_msg = "Web search error: {0}".format(error_code)
+                    view_ref = chat_view
+
+                    def show_web_search_error(msg=err_msg, v=view_ref):
+                        if v and v.window():
+                            claudette_chat_status_message(
+                                v.window(), msg, "⚠️"
+                            )
+                        sublime.status_message(msg)
+
+                    post(show_web_search_error)
+                else:
+                    stream_web_search_sources.extend(sources_lines)
+                    post(sublime.status_message, "")
+
+        def on_content_block_delta(data):
+            nonlocal last_citation_link
+            delta = data.get("delta") or {}
+            if (
+                data.get("index") == stream_current_block_index
+                and stream_current_block_type == "web_search_tool_result"
+            ):
+                # Accumulate content from delta (API may
+                # send results incrementally)
+                items = delta.get("content")
+                if isinstance(items, dict):
+                    items = [items]
+                if isinstance(items, list):
+                    sources_lines, has_error = parse_web_search_items(items)
+                    if not has_error:
+                        stream_web_search_sources.extend(sources_lines)
+
+            # Handle content updates (text and optional citations)
+            text = delta.get("text")
+            if text:
+                delta_type = delta.get("type")
+                if delta_type is None or delta_type == "text_delta":
+                    post_text(text_callback, text)
+                    last_citation_link = None
+            # Render citations as links when the API
+            # sends them (e.g. web search). Skip a link identical to the
+            # one right before it; the API often repeats a source.
+            citations = delta.get("citations")
+            if not isinstance(citations, list):
+                return
+            for cit in citations:
+                if isinstance(cit, dict):
+                    url = cit.get("url") or ""
+                    title = cit.get("title") or url or "Source"
+                    if url:
+                        link = " [{0}]({1}) ".format(title, url)
+                        if link == last_citation_link:
+                            continue
+                        last_citation_link = link
+                        post_text(text_callback, link)
+
+        def on_content_block_stop(data):
+            nonlocal stream_current_block_type, stream_current_block_index
+            idx = data.get("index")
+            if (
+                idx == stream_current_block_index
+                and stream_current_block_type == "web_search_tool_result"
+                and stream_web_search_sources
+            ):
+                sources_text = format_search_results(stream_web_search_sources)
+                post(
+                    chunk_callback,
+                    sources_text,
+                    is_done=False,
+                    insert_after_response_header=True,
+                )
+            if idx == stream_current_block_index:
+                stream_current_block_type = None
+                stream_current_block_index = None
+
+        def on_message_delta(data):
+            # Get final output tokens from message_delta
+            nonlocal output_tokens
+            usage = data.get("usage")
+            if usage is not None:
+                output_tokens = usage.get("output_tokens", 0)
+
+        def on_message_stop(data):
+            # Send token information at the end
+            nonlocal web_search_requests, message_stopped
+            message_stopped = True
+            # Cache token counts were read from message_start
+            usage = data.get("usage") or {}
+            server_tool_use = usage.get("server_tool_use") or {}
+            web_search_requests = server_tool_use.get("web_search_requests", 0)
+
+            # Current response cost including cache and web search
+            current_cost = session_stats.calculate_cost(
+                self.pricing,
+                self.model,
+                input_tokens,
+                output_tokens,
+                cache_read_tokens=cache_read_tokens,
+                cache_write_tokens=cache_write_tokens,
+                price_tier=self._price_tier,
+            )
+            web_search_cost = web_search_requests * (10.0 / 1000)
+            current_cost += web_search_cost
+
+            # Update chat view's session stats
+            sess = update_session_stats(
+                chat_view,
+                input_tokens,
+                output_tokens,
+                current_cost,
+                web_search_requests,
+            )
+            session_cost = sess["cost"] if sess else current_cost
+
+            status_msg = format_status_message(
+                input_tokens,
+                output_tokens,
+                cache_info,
+                current_cost,
+                session_cost,
+            )
+
+            # Stop the spinner here rather than after the loop: its status
+            # bar reset and the summary go through the async queue in
+            # order, so the summary is not cleared and needs no delayed
+            # main-thread hop.
+            self.spinner.stop()
+            sublime.set_timeout_async(
+                partial(sublime.status_message, status_msg), 0
+            )
+
+            # Signal completion with usage info
+            usage_info = {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost": current_cost,
+                "session_cost": session_cost,
+            }
+            post(chunk_callback, "", is_done=True, usage_info=usage_info)
+
+        # SSE event type -> handler; unknown types are ignored
+        event_handlers = {
+            "message_start": on_message_start,
+            "content_block_start": on_content_block_start,
+            "content_block_delta": on_content_block_delta,
+            "content_block_stop": on_content_block_stop,
+            "message_delta": on_message_delta,
+            "message_stop": on_message_stop,
+        }
+
         try:
             self.spinner.start("Fetching response")
 
@@ -655,402 +1164,79 @@ class ClaudetteClaudeAPI:
             }
             headers.update(self._get_custom_headers())
 
-            filtered_messages = [
-                msg for msg in messages if self._message_has_content(msg)
-            ]
-
             system_messages = self._build_system_messages(chat_view)
 
             data = {
                 "messages": filtered_messages,
-                "max_tokens": self.max_tokens,
-                "model": self.model,
+                **self._base_payload,
                 "stream": True,
                 "system": system_messages,
-                "temperature": self.get_valid_temperature(self.temperature),
             }
 
-            web_search_tool = build_web_search_tool_def(self.settings)
-            if web_search_tool:
-                data["tools"] = [web_search_tool]
-
-            req = urllib.request.Request(
-                urllib.parse.urljoin(self.base_url, "messages"),
-                data=json.dumps(data).encode("utf-8"),
-                headers=headers,
-                method="POST",
-            )
+            if self.web_search_tool:
+                data["tools"] = [self.web_search_tool]
 
             try:
                 ssl_context = self._get_ssl_context()
-                stream_web_search_sources = []
-                stream_current_block_type = None
-                stream_current_block_index = None
 
-                # Use a timeout so connection doesn't hang forever
-                with urllib.request.urlopen(
-                    req, context=ssl_context, timeout=30
+                # Use a timeout so connection doesn't hang forever. The
+                # connection is kept alive and reused by the next turn.
+                with connection.open_request(
+                    self.messages_url,
+                    data=_encode_request_body(data),
+                    headers=headers,
+                    context=ssl_context,
+                    timeout=30,
                 ) as response:
-                    # Get socket for select-based polling with timeout
-                    # This allows us to periodically check for cancellation
-                    sock = None
-                    try:
-                        # Try to get the underlying socket
-                        if hasattr(response.fp, "raw"):
-                            raw = response.fp.raw
-                            if hasattr(raw, "_sock"):
-                                sock = raw._sock
-                    except Exception:
-                        pass
-
-                    # When we cannot extract the raw socket for select(),
-                    # set a short read timeout so readline() doesn't block
-                    # indefinitely — this lets us check cancellation often.
-                    if sock is None:
-                        try:
-                            response.fp._sock.settimeout(0.5)
-                        except Exception:
-                            pass
-
-                    while True:
-                        # Check for cancellation before reading
-                        if is_cancelled():
-                            response.close()
-                            sublime.set_timeout(
-                                lambda: chunk_callback(
-                                    "", is_done=True, was_cancelled=True
-                                ),
-                                0,
-                            )
-                            return
-
-                        # Use select to wait for data with timeout
-                        if sock is not None:
-                            try:
-                                ready, _, _ = select.select(
-                                    [sock], [], [], 0.3
-                                )
-                                if not ready:
-                                    # Timeout, check cancellation and retry
-                                    continue
-                            except (ValueError, OSError, TypeError):
-                                # Socket issue, fall through to blocking read
-                                sock = None
-                                try:
-                                    response.fp._sock.settimeout(0.5)
-                                except Exception:
-                                    pass
-
-                        try:
-                            line = response.readline()
-                        except socket.timeout:
-                            # Read timed out — loop back to check cancellation
+                    for line in self._iter_response_lines(
+                        response, is_cancelled
+                    ):
+                        # Skip blank, event: and comment lines before
+                        # decoding anything.
+                        if not line.startswith(b"data: "):
                             continue
-                        if not line:
-                            # End of stream
+
+                        # Remove 'data: ' prefix
+                        payload = line[6:].strip()
+                        if payload == b"[DONE]":
                             break
 
-                        if line.isspace():
+                        text = _parse_text_delta(payload)
+                        if text is not None:
+                            if text:
+                                post_text(text_callback, text)
+                                last_citation_link = None
                             continue
 
                         try:
-                            chunk = line.decode("utf-8")
-                            if not chunk.startswith("data: "):
-                                continue
-
-                            chunk = chunk[6:]  # Remove 'data: ' prefix
-                            if chunk.strip() == "[DONE]":
-                                break
-
-                            data = json.loads(chunk)
-
-                            # Get initial input tokens from message_start
-                            if data.get("type") == "message_start":
-                                if (
-                                    "message" in data
-                                    and "usage" in data["message"]
-                                ):
-                                    usage = data["message"]["usage"]
-                                    input_tokens = usage.get("input_tokens", 0)
-                                    cache_read_tokens = usage.get(
-                                        "cache_read_input_tokens", 0
-                                    )
-                                    cache_write_tokens = usage.get(
-                                        "cache_write_input_tokens", 0
-                                    )
-                                    if cache_read_tokens > 0:
-                                        cache_info = (
-                                            " (cache read: "
-                                            f"{cache_read_tokens:,})"
-                                        )
-                                    elif cache_write_tokens > 0:
-                                        cache_info = (
-                                            " (cache write: "
-                                            f"{cache_write_tokens:,})"
-                                        )
-
-                            # Web search: track block and accumulate sources
-                            # from start/delta/stop
-                            if data.get("type") == "content_block_start":
-                                content_block = data.get("content_block", {})
-                                block_type = content_block.get("type")
-                                idx = data.get("index")
-                                stream_current_block_index = idx
-                                stream_current_block_type = block_type
-
-                                if (
-                                    block_type == "server_tool_use"
-                                    and content_block.get("name")
-                                    == "web_search"
-                                ):
-                                    sublime.set_timeout(
-                                        lambda: sublime.status_message(
-                                            "Searching the web..."
-                                        ),
-                                        0,
-                                    )
-                                elif block_type == "web_search_tool_result":
-                                    stream_web_search_sources = []
-                                    sources_lines, has_error = (
-                                        parse_web_search_items(
-                                            content_block.get("content", [])
-                                        )
-                                    )
-                                    if has_error:
-                                        err_item = next(
-                                            (
-                                                it
-                                                for it in (
-                                                    content_block.get(
-                                                        "content"
-                                                    )
-                                                    or []
-                                                )
-                                                if isinstance(it, dict)
-                                                and it.get("type")
-                                                == (
-                                                    "web_search_tool_result_error"
-                                                )
-                                            ),
-                                            None,
-                                        )
-                                        error_code = (
-                                            err_item.get(
-                                                "error_code", "unavailable"
-                                            )
-                                            if err_item
-                                            else "unavailable"
-                                        )
-                                        err_msg = (
-                                            "Web search error: {0}".format(
-                                                error_code
-                                            )
-                                        )
-                                        view_ref = chat_view
-
-                                        def show_web_search_error(
-                                            msg=err_msg, v=view_ref
-                                        ):
-                                            if v and v.window():
-                                                claudette_chat_status_message(
-                                                    v.window(), msg, "⚠️"
-                                                )
-                                            sublime.status_message(msg)
-
-                                        sublime.set_timeout(
-                                            show_web_search_error, 0
-                                        )
-                                    else:
-                                        stream_web_search_sources.extend(
-                                            sources_lines
-                                        )
-                                        sublime.set_timeout(
-                                            lambda: sublime.status_message(""),
-                                            0,
-                                        )
-
-                            elif data.get("type") == "content_block_delta":
-                                delta = data.get("delta", {})
-                                idx = data.get("index")
-                                if (
-                                    idx == stream_current_block_index
-                                    and stream_current_block_type
-                                    == "web_search_tool_result"
-                                ):
-                                    # Accumulate content from delta (API may
-                                    # send results incrementally)
-                                    items = delta.get("content")
-                                    if isinstance(items, list):
-                                        sources_lines, has_error = (
-                                            parse_web_search_items(items)
-                                        )
-                                        if not has_error:
-                                            stream_web_search_sources.extend(
-                                                sources_lines
-                                            )
-                                    elif isinstance(items, dict):
-                                        sources_lines, has_error = (
-                                            parse_web_search_items([items])
-                                        )
-                                        if not has_error:
-                                            stream_web_search_sources.extend(
-                                                sources_lines
-                                            )
-
-                            elif data.get("type") == "content_block_stop":
-                                idx = data.get("index")
-                                if (
-                                    idx == stream_current_block_index
-                                    and stream_current_block_type
-                                    == "web_search_tool_result"
-                                    and stream_web_search_sources
-                                ):
-                                    sources_text = format_search_results(
-                                        stream_web_search_sources
-                                    )
-
-                                    def _send_sources(
-                                        t=sources_text, cb=chunk_callback
-                                    ):
-                                        cb(
-                                            t,
-                                            is_done=False,
-                                            insert_after_response_header=True,
-                                        )
-
-                                    sublime.set_timeout(_send_sources, 0)
-                                if idx == stream_current_block_index:
-                                    stream_current_block_type = None
-                                    stream_current_block_index = None
-
-                            # Handle content updates (text and optional
-                            # citations)
-                            if "delta" in data:
-                                delta = data["delta"]
-                                text = delta.get("text")
-                                if text and (
-                                    delta.get("type") == "text_delta"
-                                    or "type" not in delta
-                                ):
-                                    sublime.set_timeout(
-                                        lambda t=text: chunk_callback(
-                                            t, is_done=False
-                                        ),
-                                        0,
-                                    )
-                                # Render citations as links when the API
-                                # sends them (e.g. web search).
-                                citations = (
-                                    delta.get("citations")
-                                    if isinstance(delta.get("citations"), list)
-                                    else []
-                                )
-                                for cit in citations:
-                                    if isinstance(cit, dict):
-                                        url = cit.get("url") or ""
-                                        title = (
-                                            cit.get("title") or url or "Source"
-                                        )
-                                        if url:
-                                            link_md = " [{0}]({1}) ".format(
-                                                title, url
-                                            )
-
-                                            def _send_citation(
-                                                md=link_md, cb=chunk_callback
-                                            ):
-                                                cb(md, is_done=False)
-
-                                            sublime.set_timeout(
-                                                _send_citation, 0
-                                            )
+                            # json.loads accepts UTF-8 bytes directly
+                            data = json.loads(payload)
+                        except ValueError:
+                            # Skip invalid chunks without error messages
+                            continue
+                        if not isinstance(data, dict):
+                            continue
 
-                            # Get final output tokens from message_delta
-                            if (
-                                data.get("type") == "message_delta"
-                                and "usage" in data
+                        handler = event_handlers.get(data.get("type"))
+                        if handler:
+                            try:
+                                handler(data)
+                            except (
+                                AttributeError,
+                                KeyError,
+                                TypeError,
+                                ValueError,
                             ):
-                                output_tokens = data["usage"].get(
-                                    "output_tokens", 0
-                                )
-
-                            # Send token information at the end
-                            if data.get("type") == "message_stop":
-                                # Get cache token information
-                                usage = data.get("usage", {})
-                                cache_read_tokens = usage.get(
-                                    "cache_read_input_tokens", 0
-                                )
-                                cache_write_tokens = usage.get(
-                                    "cache_write_input_tokens", 0
-                                )
-                                server_tool_use = usage.get(
-                                    "server_tool_use", {}
-                                )
-                                web_search_requests = server_tool_use.get(
-                                    "web_search_requests", 0
-                                )
-
-                                # Current response cost including cache and
-                                # web search
-                                current_cost = session_stats.calculate_cost(
-                                    self.pricing,
-                                    self.model,
-                                    input_tokens,
-                                    output_tokens,
-                                    cache_read_tokens=cache_read_tokens,
-                                    cache_write_tokens=cache_write_tokens,
-                                )
-                                web_search_cost = web_search_requests * (
-                                    10.0 / 1000
-                                )
-                                current_cost += web_search_cost
-
-                                # Update chat view's session stats
-                                sess = update_session_stats(
-                                    chat_view,
-                                    input_tokens,
-                                    output_tokens,
-                                    current_cost,
-                                    web_search_requests,
-                                )
-                                session_cost = (
-                                    sess["cost"] if sess else current_cost
-                                )
-
-                                status_msg = format_status_message(
-                                    input_tokens,
-                                    output_tokens,
-                                    cache_info,
-                                    current_cost,
-                                    session_cost,
-                                )
-
-                                sublime.set_timeout(
-                                    lambda s=status_msg: (
-                                        sublime.status_message(s)
-                                    ),
-                                    100,
-                                )
-
-                                # Signal completion with usage info
-                                usage_info = {
-                                    "input_tokens": input_tokens,
-                                    "output_tokens": output_tokens,
-                                    "cost": current_cost,
-                                    "session_cost": session_cost,
-                                }
-                                sublime.set_timeout(
-                                    lambda u=usage_info: chunk_callback(
-                                        "", is_done=True, usage_info=u
-                                    ),
-                                    0,
-                                )
+                                # Event with an unexpected shape
+                                pass
 
-                        except Exception:
-                            # Skip invalid chunks without error messages
-                            continue
+                        if message_stopped:
+                            # Nothing follows message_stop; the server
+                            # keeps the connection open for reuse.
+                            break
 
+            except CancelledException:
+                post(chunk_callback, "", is_done=True, was_cancelled=True)
             except urllib.error.HTTPError as e:
                 error_type, error_message = parse_api_error(e)
                 if is_model_not_found_error(e.code, error_type, error_message):
@@ -1063,14 +1249,19 @@ class ClaudetteClaudeAPI:
             except urllib.error.URLError as e:
                 handle_error(f"[Error] {str(e)}")
             finally:
-                self.spinner.stop()
+                if self.spinner.active:
+                    self.spinner.stop()
 
         except Exception as e:
             handle_error(f"[Error] {str(e)}")
             self.spinner.stop()
 
     def fetch_models(self):
+        """Return the available model ids, or [] on error.
 
+        Results are reused for MODELS_CACHE_TTL_SECONDS per endpoint and
+        API key.
+        """
         if not self.api_key:
             sublime.error_message(
                 "The API key is undefined. Please check your API key "
@@ -1078,6 +1269,14 @@ class ClaudetteClaudeAPI:
             )
             return []
 
+        cache_key = (self.models_url, self.api_key)
+        cached = _models_cache.get(cache_key)
+        if (
+            cached is not None
+            and time.monotonic() - cached[0] < MODELS_CACHE_TTL_SECONDS
+        ):
+            return list(cached[1])
+
         try:
             sublime.status_message("Fetching models")
             headers = {
@@ -1086,18 +1285,18 @@ class ClaudetteClaudeAPI:
             }
             headers.update(self._get_custom_headers())
 
-            req = urllib.request.Request(
-                urllib.parse.urljoin(self.base_url, "models"),
+            ssl_context = self._get_ssl_context()
+            with connection.open_request(
+                self.models_url,
                 headers=headers,
+                context=ssl_context,
                 method="GET",
-            )
-
-            ssl_context = self._get_ssl_context()
-            with urllib.request.urlopen(req, context=ssl_context) as response:
-                data = json.loads(response.read().decode("utf-8"))
-                model_ids = [item["id"] for item in data["data"]]
+            ) as response:
+                data = json.loads(response.read())
+                model_ids = list(map(itemgetter("id"), data["data"]))
+                _models_cache[cache_key] = (time.monotonic(), model_ids)
                 sublime.status_message("")
-                return model_ids
+                return list(model_ids)
 
         except urllib.error.HTTPError as e:
             if e.code == 401:
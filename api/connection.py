@@ -0,0 +1,190 @@
+"""Persistent HTTP(S) connections for API requests.
+
+A ClaudetteClaudeAPI instance is created for every request, so keep-alive
+connections are pooled here at module level and shared across turns. This
+saves a TCP and TLS handshake per message. Requests that must go through a
+configured proxy fall back to urllib.request.urlopen.
+"""
+
+import contextlib
+import http.client
+import io
+import select
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# Idle connections kept per (scheme, host, port, TLS verify mode)
+MAX_IDLE_PER_HOST = 2
+
+_lock = threading.Lock()
+_idle = {}
+
+
+def _pool_key(parts, context):
+    verify_mode = context.verify_mode if context is not None else None
+    return (parts.scheme, parts.hostname, parts.port, verify_mode)
+
+
+def _uses_proxy(parts):
+    """Return True if urllib would route this URL through a proxy."""
+    proxies = urllib.request.getproxies()
+    if not proxies.get(parts.scheme):
+        return False
+    return not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def _is_stale(conn):
+    """Return True if an idle connection was closed by the server.
+
+    An idle keep-alive socket must not be readable; if it is, the server
+    has closed it (or sent something unexpected) and it cannot be reused.
+    """
+    if conn.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _acquire(key):
+    with _lock:
+        idle = _idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if not _is_stale(conn):
+                return conn
+            conn.close()
+    return None
+
+
+def _release(key, conn, reusable):
+    if reusable:
+        with _lock:
+            idle = _idle.setdefault(key, [])
+            if len(idle) < MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+    conn.close()
+
+
+def _new_connection(parts, context, timeout):
+    # Pass host[:port] from the netloc (minus any userinfo) and let
+    # http.client split it, so bracketed IPv6 literals like [::1] work.
+    host = parts.netloc.rpartition("@")[2]
+    if parts.scheme == "https":
+        return http.client.HTTPSConnection(
+            host, timeout=timeout, context=context
+        )
+    return http.client.HTTPConnection(host, timeout=timeout)
+
+
+def _send(key, parts, method, body, headers, context, timeout):
+    """Send a request, retrying once if a reused connection went stale.
+
+    Returns (connection, response).
+    """
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+
+    while True:
+        conn = _acquire(key)
+        reused = conn is not None
+        if reused:
+            conn.timeout = timeout
+            conn.sock.settimeout(timeout)
+        else:
+            conn = _new_connection(parts, context, timeout)
+
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            return conn, conn.getresponse()
+        except ConnectionError as e:
+            conn.close()
+            if reused:
+                # Server dropped the keep-alive connection; use a new one
+                continue
+            raise urllib.error.URLError(e)
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise urllib.error.URLError(e)
+
+
+@contextlib.contextmanager
+def open_request(
+    url, data=None, headers=None, context=None, timeout=30, method="POST"
+):
+    """Open an API request over a pooled connection.
+
+    Used like ``with urllib.request.urlopen(...) as response`` and raises
+    the same urllib.error.HTTPError / URLError exceptions. The connection
+    goes back to the pool only if the response body was read to the end
+    and the with block exited without an exception.
+
+    Args:
+        url: Absolute request URL.
+        data: Request body bytes, or None.
+        headers: Dict of request headers.
+        context: ssl.SSLContext for https URLs.
+        timeout: Socket timeout in seconds.
+        method: HTTP method.
+
+    Yields:
+        http.client.HTTPResponse
+    """
+    headers = headers or {}
+    parts = urllib.parse.urlsplit(url)
+
+    if _uses_proxy(parts):
+        req = urllib.request.Request(
+            url, data=data, headers=headers, method=method
+        )
+        with urllib.request.urlopen(
+            req, context=context, timeout=timeout
+        ) as response:
+            yield response
+        return
+
+    key = _pool_key(parts, context)
+    conn, response = _send(
+        key, parts, method, data, headers, context, timeout
+    )
+
+    if not 200 <= response.status < 300:
+        try:
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            body = b""
+            response.will_close = True
+        _release(key, conn, not response.will_close)
+        raise urllib.error.HTTPError(
+            url, response.status, response.reason, response.msg,
+            io.BytesIO(body),
+        )
+
+    reusable = False
+    try:
+        yield response
+        # Consume whatever is left (e.g. the final chunk terminator) so
+        # the connection is positioned at the next response.
+        if not response.isclosed():
+            try:
+                response.read()
+            except (OSError, http.client.HTTPException):
+                return
+        reusable = not response.will_close
+    finally:
+        _release(key, conn, reusable)
+
+
+def close_all():
+    """Close every idle pooled connection."""
+    with _lock:
+        conns = [conn for idle in _idle.values() for conn in idle]
+        _idle.clear()
+    for conn in conns:
+        conn.close()
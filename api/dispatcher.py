@@ -0,0 +1,65 @@
+"""Deliver streaming callbacks from the API thread to Sublime's main thread."""
+
+import collections
+import threading
+import traceback
+
+import sublime
+
+from ..constants import PLUGIN_NAME, STREAM_DISPATCH_INTERVAL_MS
+
+
+class MainThreadDispatcher:
+    """Queue callbacks on a worker thread and run them on the main thread.
+
+    Instead of one sublime.set_timeout per callback, the first post after
+    an idle period schedules a single pump STREAM_DISPATCH_INTERVAL_MS
+    later, which runs everything queued in the meantime. Consecutive text
+    posts for the same callback are passed to it as one list, so it can
+    update the view once and still see where each piece of text ended.
+    """
+
+    def __init__(self, interval_ms=STREAM_DISPATCH_INTERVAL_MS):
+        self._items = collections.deque()
+        self._interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def post(self, callback, *args, **kwargs):
+        """Queue callback(*args, **kwargs) to run on the main thread."""
+        self._items.append((callback, args, kwargs, False))
+        self._schedule()
+
+    def post_text(self, callback, text):
+        """Queue text for callback(parts), batched with adjacent text."""
+        self._items.append((callback, (text,), {}, True))
+        self._schedule()
+
+    def _schedule(self):
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        sublime.set_timeout(self._pump, self._interval_ms)
+
+    def _pump(self):
+        # Clear the flag before draining so anything posted from here on
+        # schedules another pump instead of being left in the queue.
+        with self._lock:
+            self._scheduled = False
+
+        items = self._items
+        while items:
+            callback, args, kwargs, is_text = items.popleft()
+            if is_text:
+                parts = [args[0]]
+                while items and items[0][3] and items[0][0] is callback:
+                    parts.append(items.popleft()[1][0])
+                args = (parts,)
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                # Keep draining the queue, but log the traceback as
+                # Sublime would for a failing set_timeout callback.
+                print(f"{PLUGIN_NAME} Error in streaming callback:")
+                traceback.print_exc()
@@ -12,14 +12,14 @@ def parse_api_error(http_error):
     Returns:
         tuple: (error_type: str, error_message: str)
     """
-    error_content = http_error.read().decode("utf-8")
     error_type = ""
     error_message = ""
     try:
-        err_data = json.loads(error_content)
-        error_type = err_data.get("error", {}).get("type", "")
-        error_message = err_data.get("error", {}).get("message", "")
-    except (json.JSONDecodeError, AttributeError, KeyError):
+        err_data = json.loads(http_error.read())
+        error = err_data.get("error", {})
+        error_type = error.get("type", "")
+        error_message = error.get("message", "")
+    except (ValueError, AttributeError, KeyError):
         pass
 
     if not error_message:
@@ -1,9 +1,36 @@
+import contextlib
+
 import sublime
 
+from ..chat.fenced_code import fence_after_line
 from ..utils import claudette_chat_status_message
 
 
+@contextlib.contextmanager
+def _editable(view):
+    """Make view writable for the duration of the block."""
+    view.set_read_only(False)
+    try:
+        yield
+    finally:
+        view.set_read_only(True)
+
+
 class ClaudetteStreamingResponseHandler:
+    __slots__ = (
+        "view",
+        "on_complete",
+        "response_header_end",
+        "line_buffer",
+        "at_line_start",
+        "_last_output_char",
+        "_fence",
+        "_line_head",
+        "_deferred_chunks",
+        "_completed",
+        "_usage_info",
+    )
+
     def __init__(self, view, on_complete=None, response_header_end=None):
         self.view = view
         self.on_complete = on_complete
@@ -11,28 +38,52 @@ class ClaudetteStreamingResponseHandler:
         self.line_buffer = ""
         self.at_line_start = True
         self._last_output_char = None
+        # Open code fence as (fence_char, fence_len), or None
+        self._fence = None
+        # Current line so far while it may still be a fence line, else None
+        self._line_head = ""
         self._deferred_chunks = []
         self._completed = False
         self._usage_info = None
 
     def _output_text(self, text):
-        """Output text to the view."""
+        """Output text to the view.
+
+        append with force=True writes to read-only views (as Default's exec
+        output panel does), so no read-only toggling is needed per chunk.
+        """
         if text:
-            self.view.set_read_only(False)
             self.view.run_command(
                 "append",
                 {"characters": text, "force": True, "scroll_to_end": False},
             )
-            self.view.set_read_only(True)
             self._last_output_char = text[-1]
 
+    def _track_line(self, text):
+        """Follow code fences opening and closing in the streamed text.
+
+        text holds at most one newline, at its end. Lines are only kept
+        while they start with a fence character, so code lines are not
+        accumulated.
+        """
+        head = self._line_head
+        if head is not None:
+            head += text
+            stripped = head.lstrip(" \t")
+            if stripped and stripped[0] not in "`~":
+                head = None
+        if text.endswith("\n"):
+            if head is not None:
+                self._fence = fence_after_line(head[:-1], self._fence)
+            head = ""
+        self._line_head = head
+
     def _insert_at_response_header(self, text):
         """Insert text after # Claude's Response (before streamed body)."""
         if self.response_header_end is None or not text:
             return
         pos = self.response_header_end
-        self.view.set_read_only(False)
-        try:
+        with _editable(self.view):
             self.view.sel().clear()
             self.view.sel().add(sublime.Region(pos, pos))
             self.view.run_command("insert", {"characters": text})
@@ -40,8 +91,6 @@ class ClaudetteStreamingResponseHandler:
             self.view.sel().add(
                 sublime.Region(self.view.size(), self.view.size())
             )
-        finally:
-            self.view.set_read_only(True)
         if text:
             self._last_output_char = text[-1]
 
@@ -64,8 +113,7 @@ class ClaudetteStreamingResponseHandler:
         if defer_to_end and chunk:
             self._deferred_chunks.append(chunk)
             if self._completed:
-                for deferred in self._deferred_chunks:
-                    self._output_text(deferred)
+                self._output_text("".join(self._deferred_chunks))
                 self._deferred_chunks = []
             return
 
@@ -82,58 +130,100 @@ class ClaudetteStreamingResponseHandler:
                 self.on_complete()
             return
 
+        self.append_text(chunk, is_done)
+
+    def append_text(self, chunk, is_done=False):
+        """Append streamed response text.
+
+        The part of append_chunk that handles plain text.
+        """
+        out = []
+        self._convert_text(chunk, out)
+
+        if is_done:
+            # Flush the buffer, then deferred content (e.g. Search Results)
+            # after the answer, all in the same append.
+            out.append(self.line_buffer)
+            self.line_buffer = ""
+            out.extend(self._deferred_chunks)
+            self._deferred_chunks = []
+
+        if out:
+            self._output_text("".join(out))
+
+        if is_done:
+            self._completed = True
+            if self.on_complete:
+                self.on_complete(usage_info=self._usage_info)
+
+    def append_text_parts(self, parts):
+        """Append a batch of streamed text deltas in a single append.
+
+        Called directly for text deltas, skipping the header, defer and
+        cancel checks. Each delta is converted as if it arrived on its own,
+        so the sentence line break below still sees every delta boundary
+        rather than only where batches happen to split.
+        """
+        out = []
+        for chunk in parts:
+            self._convert_text(chunk, out)
+        if out:
+            self._output_text("".join(out))
+
+    def _convert_text(self, chunk, out):
+        """Add the pieces to write for one streamed delta to out."""
+        last_char = out[-1][-1] if out else self._last_output_char
+
         # Line break when a new sentence starts without separator
-        # (e.g. "results.Based")
+        # (e.g. "results.Based"), except inside code fences
         if (
             chunk
+            and self._fence is None
             and chunk[0].isupper()
-            and self._last_output_char is not None
-            and self._last_output_char in ".!?"
+            and last_char is not None
+            and last_char in ".!?"
             and not self.at_line_start
         ):
-            self._output_text("\n")
+            out.append("\n")
+            self._track_line("\n")
             self.at_line_start = True
 
-        # Process chunk character by character to convert h1 headings to h2,
-        # keeping h1 reserved for user questions in the symbol list.
-        for char in chunk:
-            if self.at_line_start:
-                self.line_buffer += char
-                if self.line_buffer == "# ":
-                    # Convert h1 to h2
-                    self._output_text("## ")
+        # Convert h1 headings to h2, keeping h1 reserved for user questions
+        # in the symbol list. Only the start of a line outside a code fence
+        # needs a closer look (a "# " in code is a comment, not a heading);
+        # everything else is copied a line at a time, and the whole chunk
+        # goes to the view in a single append.
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if self.at_line_start and self._fence is None:
+                char = chunk[i]
+                i += 1
+                if self.line_buffer:
+                    # A "#" is pending from the previous character
                     self.line_buffer = ""
-                    self.at_line_start = False
-                elif self.line_buffer == "#":
+                    if char == " ":
+                        piece = "## "
+                        self.at_line_start = False
+                    else:
+                        piece = "#" + char
+                        self.at_line_start = char == "\n"
+                elif char == "#":
                     # Could be h1, keep buffering
-                    pass
-                elif self.line_buffer.startswith("##"):
-                    # Already h2 or lower, output and continue
-                    self._output_text(self.line_buffer)
-                    self.line_buffer = ""
-                    self.at_line_start = False
-                elif not "# ".startswith(self.line_buffer):
-                    # Not going to be an h1, output buffer
-                    self._output_text(self.line_buffer)
-                    self.line_buffer = ""
-                    self.at_line_start = False
+                    self.line_buffer = char
+                    continue
+                else:
+                    piece = char
+                    self.at_line_start = char == "\n"
             else:
-                self._output_text(char)
-
-            if char == "\n":
-                self.at_line_start = True
-
-        # Flush buffer on completion
-        if is_done and self.line_buffer:
-            self._output_text(self.line_buffer)
-            self.line_buffer = ""
-
-        if is_done:
-            # Output deferred content (e.g. Search Results) after the answer
-            if self._deferred_chunks:
-                for deferred in self._deferred_chunks:
-                    self._output_text(deferred)
-                self._deferred_chunks = []
-            self._completed = True
-            if self.on_complete:
-                self.on_complete(usage_info=self._usage_info)
+                newline = chunk.find("\n", i)
+                if newline == -1:
+                    piece = chunk[i:]
+                    i = n
+                    self.at_line_start = False
+                else:
+                    piece = chunk[i : newline + 1]
+                    i = newline + 1
+                    self.at_line_start = True
+            out.append(piece)
+            self._track_line(piece)
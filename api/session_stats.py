@@ -1,5 +1,11 @@
 """Session statistics tracking and cost calculation."""
 
+import functools
+import re
+
+# Rates a pricing tier may define, per 1M tokens
+_PRICE_KEYS = ("input", "output", "cache_write", "cache_read")
+
 
 def _default_session_stats():
     """Return a fresh default session stats dict."""
@@ -11,6 +17,42 @@ def _default_session_stats():
     }
 
 
+@functools.lru_cache(maxsize=8)
+def _tier_pattern(tier_names):
+    """Compile one alternation matching any of the given tier names.
+
+    Longer names come first so a more specific tier wins over a shorter
+    one it contains.
+    """
+    return re.compile(
+        "|".join(
+            re.escape(name)
+            for name in sorted(tier_names, key=len, reverse=True)
+        )
+    )
+
+
+def find_price_tier(pricing, model):
+    """Return the pricing tier dict matching a model name, or None.
+
+    Args:
+        pricing: Pricing dict from settings (tier_name -> input/output/etc.).
+        model: Model name string.
+
+    Returns:
+        dict or None: The tier whose name occurs in the model name, with
+            every rate in _PRICE_KEYS present (missing rates are 0).
+    """
+    if not pricing or not model:
+        return None
+
+    match = _tier_pattern(tuple(pricing)).search(model.lower())
+    if match is None:
+        return None
+    tier = pricing[match.group(0)]
+    return {key: tier.get(key, 0) for key in _PRICE_KEYS}
+
+
 def calculate_cost(
     pricing,
     model,
@@ -18,47 +60,37 @@ def calculate_cost(
     output_tokens,
     cache_read_tokens=0,
     cache_write_tokens=0,
+    price_tier=None,
 ):
     """Calculate cost based on token usage and model.
 
     Args:
         pricing: Pricing dict from settings (tier_name -> input/output/etc.).
         model: Model name string.
-        input_tokens: Number of input tokens.
+        input_tokens: Number of uncached input tokens (the API reports
+            cache reads and writes separately).
         output_tokens: Number of output tokens.
         cache_read_tokens: Number of tokens read from cache.
         cache_write_tokens: Number of tokens written to cache.
+        price_tier: Optional pre-resolved tier from find_price_tier(); skips
+            the lookup in pricing when given. Must define every rate.
 
     Returns:
         float: The calculated cost.
     """
-    if not pricing or not model:
-        return 0
-
-    price_tier = None
-    model_lower = model.lower()
-
-    for tier in pricing.keys():
-        if tier in model_lower:
-            price_tier = pricing[tier]
-            break
+    if price_tier is None:
+        price_tier = find_price_tier(pricing, model)
 
     if not price_tier:
         return 0
 
     # Pricing is per 1M tokens
-    input_cost = ((input_tokens - cache_read_tokens) / 1_000_000) * price_tier[
-        "input"
-    ]
-    output_cost = (output_tokens / 1_000_000) * price_tier["output"]
-    cache_write_cost = (cache_write_tokens / 1_000_000) * price_tier.get(
-        "cache_write", 0
-    )
-    cache_read_cost = (cache_read_tokens / 1_000_000) * price_tier.get(
-        "cache_read", 0
-    )
-
-    return input_cost + output_cost + cache_write_cost + cache_read_cost
+    return (
+        input_tokens * price_tier["input"]
+        + output_tokens * price_tier["output"]
+        + cache_write_tokens * price_tier["cache_write"]
+        + cache_read_tokens * price_tier["cache_read"]
+    ) / 1_000_000
 
 
 def update_session_stats(
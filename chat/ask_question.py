@@ -1,5 +1,6 @@
 ﻿import random
 import threading
+from functools import partial
 
 import sublime
 import sublime_plugin
@@ -71,7 +72,7 @@ class ClaudetteAskQuestionCommand(sublime_plugin.WindowCommand):
             return None
 
     def handle_input(self, code, question):
-        if not question or question.strip() == "":
+        if not question or question.isspace():
             return None
 
         if not self.create_chat_panel():
@@ -157,81 +158,78 @@ class ClaudetteAskQuestionCommand(sublime_plugin.WindowCommand):
             if not self.chat_view:
                 return
 
-            message = "\n\n---\n\n" if self.chat_view.get_size() > 0 else ""
+            chat = self.chat_view
+            view = chat.view
+            # Position before appending; the question is scrolled to here
+            question_start = chat.get_size()
+
+            message = "\n\n---\n\n" if question_start > 0 else ""
 
             message += f"# Question\n\n{question}\n\n"
 
-            if code.strip():
+            # isspace() checks the selection without copying it like strip()
+            has_code = bool(code) and not code.isspace()
+            if has_code:
                 message += f"**Selected Code**\n\n```\n{code}\n```\n\n"
 
             user_message = question
-            if code.strip():
+            if has_code:
                 user_message = f"{question}\n\nCode:\n{code}"
 
-            conversation = self.chat_view.handle_question(user_message)
-
-            # Capture position before appending
-            question_start = self.chat_view.view.size()
+            conversation = chat.handle_question(user_message)
 
             # Save current selection before appending
-            view = self.chat_view.view
-            saved_selection = [(r.a, r.b) for r in view.sel()]
+            saved_selection = tuple(view.sel())
 
-            self.chat_view.append_text(message)
+            # Question plus the response heading, in one append, before
+            # streaming begins
+            chat.append_text(message + "# Claude's Response\n\n")
 
-            # Add response heading before streaming begins
-            self.chat_view.append_text("# Claude's Response\n\n")
-
-            if self.chat_view.get_size() > 0:
-                self.chat_view.focus()
+            # The view is never empty after the append above
+            chat.focus()
 
             def smooth_scroll_to_question():
                 target_pos = view.text_to_layout(question_start)
-                current_pos = view.viewport_position()
-                distance_y = target_pos[1] - current_pos[1]
+                current_x, current_y = view.viewport_position()
+                distance_y = target_pos[1] - current_y
                 steps = 20
                 step_delay = 15  # ms between steps
 
-                def scroll_step(step):
-                    if step >= steps:
-                        # Final position to ensure accuracy
-                        view.set_viewport_position(target_pos, animate=False)
-                        # Restore selection/cursor position
-                        view.sel().clear()
-                        if saved_selection:
-                            for a, b in saved_selection:
-                                view.sel().add(sublime.Region(a, b))
-                        else:
-                            view.sel().add(
-                                sublime.Region(question_start, question_start)
-                            )
-                        return
+                def finish_scroll():
+                    # Final position to ensure accuracy
+                    view.set_viewport_position(target_pos, animate=False)
+                    # Restore selection/cursor position
+                    selection = view.sel()
+                    selection.clear()
+                    # One call for all regions instead of one add() each
+                    selection.add_all(
+                        saved_selection
+                        or (sublime.Region(question_start, question_start),)
+                    )
 
+                # Schedule every frame up front at its own offset instead
+                # of each step scheduling the next one.
+                for step in range(steps):
                     # Ease-out animation (starts fast, slows down)
                     progress = step / steps
                     eased = 1 - (1 - progress) ** 3  # Cubic ease-out
-
-                    new_y = current_pos[1] + (distance_y * eased)
-                    view.set_viewport_position(
-                        (current_pos[0], new_y), animate=False
-                    )
-
+                    new_pos = (current_x, current_y + distance_y * eased)
                     sublime.set_timeout(
-                        lambda: scroll_step(step + 1), step_delay
+                        partial(view.set_viewport_position, new_pos, False),
+                        step * step_delay,
                     )
-
-                scroll_step(0)
+                sublime.set_timeout(finish_scroll, steps * step_delay)
 
             sublime.set_timeout(smooth_scroll_to_question, 50)
 
             api = ClaudetteClaudeAPI()
             use_text_editor = api.settings.get("text_editor_tool", False)
 
-            message_start = self.chat_view.view.size()
+            message_start = view.size()
 
             # Create cancellation token for this request, keyed to this view
-            request_view_id = self.chat_view.view.id()
-            cancellation_token = self.chat_view.start_request(request_view_id)
+            request_view_id = view.id()
+            cancellation_token = chat.start_request(request_view_id)
 
             def on_complete(usage_info=None):
                 # Clear the active request token for this view
@@ -281,9 +279,12 @@ class ClaudetteAskQuestionCommand(sublime_plugin.WindowCommand):
                     conversation,
                     self.chat_view.view,
                     cancellation_token,
+                    handler.append_text_parts,
                 )
 
-            thread = threading.Thread(target=target, args=args)
+            # Network reads and SSE parsing stay on this worker; UI updates
+            # reach the main thread through the API's batched dispatcher.
+            thread = threading.Thread(target=target, args=args, daemon=True)
             thread.start()
 
         except Exception as e:
@@ -258,8 +258,7 @@ class ClaudetteChatView:
         phantom_set.update([phantom])
         if not already_running:
             sublime.set_timeout(
-                lambda: self._schedule_tool_status_spinner(),
-                SPINNER_INTERVAL_MS,
+                self._schedule_tool_status_spinner, SPINNER_INTERVAL_MS
             )
 
     def _schedule_tool_status_spinner(self):
@@ -280,7 +279,7 @@ class ClaudetteChatView:
         phantom = sublime.Phantom(region, html, sublime.LAYOUT_INLINE, None)
         phantom_set.update([phantom])
         sublime.set_timeout(
-            lambda: self._schedule_tool_status_spinner(), SPINNER_INTERVAL_MS
+            self._schedule_tool_status_spinner, SPINNER_INTERVAL_MS
         )
 
     def clear_tool_status(self):
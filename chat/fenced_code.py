@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Tuple
 
 # Opening fence: optional indent, 3+ backticks or tildes, optional info string.
 # Info cannot contain backticks or tildes (same as CommonMark).
@@ -53,6 +53,29 @@ def _closing_fence_match(line: str, fence_char: str, min_len: int) -> bool:
     return remainder.strip() == ""
 
 
+def fence_after_line(
+    line: str, fence: Optional[Tuple[str, int]]
+) -> Optional[Tuple[str, int]]:
+    """Advance the fence state by one complete line (without its newline).
+
+    Args:
+        line: The line to inspect.
+        fence: The open fence as (fence_char, fence_len), or None.
+
+    Returns:
+        The open fence after the line, or None if no fence is open.
+    """
+    if fence is None:
+        m = _FENCE_OPEN_RE.match(line)
+        if m:
+            marker = m.group(1)
+            return (marker[0], len(marker))
+        return None
+    if _closing_fence_match(line, fence[0], fence[1]):
+        return None
+    return fence
+
+
 def _language_from_info(info: str) -> str:
     if not info or not info.strip():
         return ""
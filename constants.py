@@ -7,13 +7,16 @@ MAX_TOKENS = 8192
 PLUGIN_NAME = "Claudette"
 SETTINGS_FILE = "Claudette.sublime-settings"
 DEFAULT_VERIFY_SSL = True
+STREAM_READ_SIZE = 65536
+STREAM_DISPATCH_INTERVAL_MS = 16
+MODELS_CACHE_TTL_SECONDS = 600
 SPINNER_CHARS = (
-	["·", "✢", "✳", "✻", "✽"]
+	("·", "✢", "✳", "✻", "✽")
 	if sublime.platform() == "osx"
-	else ["·", "✢", "*", "✻", "✽"]
+	else ("·", "✢", "*", "✻", "✽")
 )
 SPINNER_INTERVAL_MS = 250
-TOOL_STATUS_MESSAGES = [
+TOOL_STATUS_MESSAGES = (
 	'Accomplishing',
 	'Actioning',
 	'Actualizing',
@@ -70,4 +73,4 @@ TOOL_STATUS_MESSAGES = [
 	'Transmuting',
 	'Vibing',
 	'Working',
-]
+)
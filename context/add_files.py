@@ -1,6 +1,7 @@
 import os
+import stat
 from pathlib import Path
-from typing import List, Set
+from typing import Iterator, List, Optional, Set
 
 import sublime
 import sublime_plugin
@@ -11,6 +12,48 @@ from ..utils import claudette_chat_status_message
 from .file_handler import ClaudetteFileHandler
 
 
+def _iter_files(top: str, skipped_dirs: List[str]) -> Iterator[str]:
+    """Yield file paths under top in os.walk's top-down order.
+
+    Uses os.scandir directly: entries carry their full path and cached file
+    type, so there is no os.path.join or extra stat per file. Like os.walk,
+    symlinked directories are not followed and unreadable directories are
+    skipped. .git directories are not entered; their paths are appended to
+    skipped_dirs.
+    """
+    subdirs = []
+    try:
+        with os.scandir(top) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield entry.path
+                elif entry.name == ".git":
+                    skipped_dirs.append(entry.path)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _iter_files(subdir, skipped_dirs)
+
+
+def _path_kind(path: str) -> Optional[str]:
+    """Return "dir", "file" or None (other or missing) from a single stat."""
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        return None
+    if stat.S_ISDIR(mode):
+        return "dir"
+    if stat.S_ISREG(mode):
+        return "file"
+    return None
+
+
 class ClaudetteGitignoreParser:
     def __init__(self, root_path: str):
         self.root_path = Path(root_path)
@@ -134,20 +177,16 @@ class ClaudetteContextAddFilesCommand(sublime_plugin.WindowCommand):
                 added_dirs.append(os.path.basename(path))
                 gitignore = ClaudetteGitignoreParser(path)
 
-                for root, dirs, files in os.walk(path):
-                    # Skip .git directories
-                    if ".git" in dirs:
-                        dirs.remove(".git")
+                # .git directories are skipped and counted as ignored
+                skipped_dirs: List[str] = []
+                for full_path in _iter_files(path, skipped_dirs):
+                    if gitignore.should_ignore(
+                        full_path, allow_git_files=False
+                    ):
                         ignored_count += 1
-
-                    for file in files:
-                        full_path = os.path.join(root, file)
-                        if gitignore.should_ignore(
-                            full_path, allow_git_files=False
-                        ):
-                            ignored_count += 1
-                            continue
-                        expanded_paths.append(full_path)
+                        continue
+                    expanded_paths.append(full_path)
+                ignored_count += len(skipped_dirs)
             else:
                 added_files.append(os.path.basename(path))
                 # For individual files, always allow git-related files
@@ -244,14 +283,17 @@ class ClaudetteContextAddFilesCommand(sublime_plugin.WindowCommand):
         if isinstance(paths, str):
             paths = [paths]
 
+        # Stat each path once instead of separate isdir/isfile passes
+        kinds = {_path_kind(p) for p in paths}
+
         # Check if all paths are directories
-        if all(os.path.isdir(p) for p in paths):
+        if kinds == {"dir"}:
             if len(paths) == 1:
                 return "Add Directory" + chat_suffix
             else:
                 return "Add Directories" + chat_suffix
         # Check if all paths are files
-        elif all(os.path.isfile(p) for p in paths):
+        elif kinds == {"file"}:
             if len(paths) == 1:
                 return "Add File" + chat_suffix
             else:
@@ -1,3 +1,6 @@
+import threading
+from functools import partial
+
 import sublime
 import sublime_plugin
 
@@ -17,11 +20,25 @@ class ClaudetteSelectModelPanelCommand(sublime_plugin.WindowCommand):
         return True
 
     def run(self):
+        # Fetching the model list is a network request; keep it off the
+        # main thread and open the panel once it is back.
+        threading.Thread(target=self._fetch_models, daemon=True).start()
+
+    def _fetch_models(self):
+        try:
+            models = ClaudetteClaudeAPI().fetch_models()
+        except Exception as e:
+            print(f"Error showing model selection panel: {str(e)}")
+            sublime.error_message(
+                f"Error showing model selection panel: {str(e)}"
+            )
+            return
+        sublime.set_timeout(partial(self._show_panel, models), 0)
+
+    def _show_panel(self, models):
         try:
-            api = ClaudetteClaudeAPI()
             settings = sublime.load_settings(SETTINGS_FILE)
             current_model = settings.get("model")
-            models = api.fetch_models()
 
             if current_model in models:
                 selected_index = models.index(current_model)
@@ -1,4 +1,5 @@
 import time
+from functools import partial
 
 import sublime
 
@@ -42,7 +43,7 @@ class ClaudetteSpinner:
             sublime.set_timeout_async(self.timer, 0)
             self.timer = None
 
-        sublime.set_timeout_async(lambda: sublime.status_message(""), 0)
+        sublime.set_timeout_async(partial(sublime.status_message, ""), 0)
 
         self.message = ""
         self.current_index = 0
@@ -66,7 +67,8 @@ class ClaudetteSpinner:
         self.current_index = (self.current_index + 1) % len(SPINNER_CHARS)
         status = f"{self.message} {spinner}"
 
-        sublime.set_timeout_async(lambda: sublime.status_message(status), 0)
+        # Runs every frame; partial() skips building a closure each time
+        sublime.set_timeout_async(partial(sublime.status_message, status), 0)
 
         self.timer = sublime.set_timeout_async(
             self.update_spinner, SPINNER_INTERVAL_MS